@@ -46,8 +46,13 @@ Dependencies to run
 - Python >= 3.9
 - asyncio
 - beautifulsoup4
+- lxml
 - rsa
 - aiohttp
+- cryptography (optional, faster password encryption)
+- numpy (optional, bulk price calculations)
+- orjson (optional, faster json parsing)
+- aiodns (optional, asynchronous dns resolution)
 
 Made with stlib
 ---------------
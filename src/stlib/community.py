@@ -24,7 +24,7 @@ import json
 import logging
 from typing import List, Tuple, Any, Dict, NamedTuple
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from stlib import universe, login, utils
 
 log = logging.getLogger(__name__)
@@ -396,6 +396,43 @@ class Community(utils.Base):
 
         return item_name
 
+    async def _get_item_names(self, item_list: Tag) -> List[str]:
+        return await self._run_concurrently(
+            self.get_item_name(*item['data-economy-item'].split('/')[1:3])
+            for item in item_list.find_all('div', class_='trade_item')
+        )
+
+    async def _get_confirmation_details(
+            self,
+            confirmation: Dict[str, Any],
+            identity_secret: str,
+            steamid: universe.SteamId,
+            deviceid: str,
+    ) -> Dict[str, Any]:
+        details_params = await self._new_mobileconf_query(
+            deviceid,
+            steamid,
+            identity_secret,
+            f"details{confirmation['id']}",
+        )
+
+        log.debug(
+            "Getting human readable information from %s as type %s (%s)",
+            confirmation['id'],
+            confirmation['type'],
+            "Market" if confirmation['type'] == 3 else 'Trade Item',
+        )
+
+        json_data = await self.request_json(
+            f"{self.mobileconf_url}/details/{confirmation['id']}",
+            params=details_params,
+        )
+
+        if not json_data['success']:
+            raise AttributeError(f"Unable to get details for confirmation {confirmation['id']}")
+
+        return json_data
+
     async def get_confirmations(
             self,
             identity_secret: str,
@@ -415,31 +452,15 @@ class Community(utils.Base):
         if not json_data['success']:
             raise login.LoginError('User is not logged in')
 
-        confirmations = []
-        for confirmation in json_data['conf']:
-            details_params = await self._new_mobileconf_query(
-                deviceid,
-                steamid,
-                identity_secret,
-                f"details{confirmation['id']}",
-            )
-
-            log.debug(
-                "Getting human readable information from %s as type %s (%s)",
-                confirmation['id'],
-                confirmation['type'],
-                "Market" if confirmation['type'] == 3 else 'Trade Item',
-            )
-
-            json_data = await self.request_json(
-                f"{self.mobileconf_url}/details/{confirmation['id']}",
-                params=details_params,
-            )
-
-            if not json_data['success']:
-                raise AttributeError(f"Unable to get details for confirmation {confirmation['id']}")
+        # details are independent from each other, so fetch them all at once
+        details_list = await self._run_concurrently(
+            self._get_confirmation_details(confirmation, identity_secret, steamid, deviceid)
+            for confirmation in json_data['conf']
+        )
 
-            html = BeautifulSoup(json_data["html"], 'html.parser')
+        confirmations = []
+        for confirmation, details in zip(json_data['conf'], details_list):
+            html = BeautifulSoup(details["html"], utils.HTML_PARSER)
 
             if confirmation['type'] in (1, 2):
                 try:
@@ -450,18 +471,10 @@ class Community(utils.Base):
                     to = trade_partner.get_text().strip()
 
                 item_list = html.find_all('div', class_="tradeoffer_item_list")
-
-                give = []
-                for item in item_list[0].find_all('div', class_='trade_item'):
-                    appid, classid = item['data-economy-item'].split('/')[1:3]
-                    name = await self.get_item_name(appid, classid)
-                    give.append(name)
-
-                receive = []
-                for item in item_list[1].find_all('div', class_='trade_item'):
-                    appid, classid = item['data-economy-item'].split('/')[1:3]
-                    name = await self.get_item_name(appid, classid)
-                    receive.append(name)
+                give, receive = await self._run_concurrently((
+                    self._get_item_names(item_list[0]),
+                    self._get_item_names(item_list[1]),
+                ))
             elif confirmation['type'] == 3:
                 to = "Market"
 
@@ -53,6 +53,8 @@ class LoginData(NamedTuple):
     """Access token"""
     transfer_info: List[TransferInfo]
     """List of `TransferInfo` associated"""
+    has_phone: bool | None = None
+    """True if user has a phone registered (None if it wasn't checked)"""
 
 
 class AuthCodeType(Enum):
@@ -136,6 +138,20 @@ class Login(utils.Base):
         self.steamguard_url = steamguard_url
         self.api_url = api_url
         self.login_trial = 3
+        self._login_data_template = {
+            'desktop': {
+                "device_friendly_name": "stlib",
+                "persistence": 1,
+                "platform_type": "2",
+                "website_id": "Community",
+            },
+            'mobile': {
+                "device_friendly_name": "stlib",
+                "persistence": 1,
+                "platform_type": "3",
+                "website_id": "Mobile",
+            },
+        }
 
     @property
     def username(self) -> str:
@@ -166,15 +182,12 @@ class Login(utils.Base):
 
         encrypted_password = universe.encrypt_password(steam_key, self.__password)
 
-        return {
-            "account_name": self.username,
-            "encrypted_password": encrypted_password.decode(),
-            "encryption_timestamp": steam_key.timestamp,
-            "device_friendly_name": "stlib",
-            "persistence": 1,
-            "platform_type": "3" if mobile_login else "2",
-            "website_id": "Mobile" if mobile_login else "Community",
-        }
+        data: Dict[str, Any] = self._login_data_template['mobile' if mobile_login else 'desktop'].copy()
+        data["account_name"] = self.username
+        data["encrypted_password"] = encrypted_password.decode()
+        data["encryption_timestamp"] = steam_key.timestamp
+
+        return data
 
     async def get_steam_key(self, username: str) -> universe.SteamKey:
         """
@@ -188,12 +201,14 @@ class Login(utils.Base):
             params=params,
         )
 
-        if not json_data['response']:
+        response = json_data['response']
+
+        if not response:
             raise ValueError('Failed to get public key.')
 
-        public_mod = int(json_data['response']['publickey_mod'], 16)
-        public_exp = int(json_data['response']['publickey_exp'], 16)
-        timestamp = int(json_data['response']['timestamp'])
+        public_mod = int(response['publickey_mod'], 16)
+        public_exp = int(response['publickey_exp'], 16)
+        timestamp = int(response['timestamp'])
         return universe.SteamKey(rsa.PublicKey(public_mod, public_exp), timestamp)
 
     async def get_captcha(self, gid: int) -> bytes:
@@ -230,7 +245,13 @@ class Login(utils.Base):
 
         return bool(json_data["has_phone"])
 
-    async def poll_login(self, steamid: int, client_id: str, request_id: str) -> LoginData | None:
+    async def poll_login(
+            self,
+            steamid: int,
+            client_id: str,
+            request_id: str,
+            check_phone: bool = False,
+    ) -> LoginData | None:
         data = {
             'client_id': client_id,
             'request_id': request_id,
@@ -241,11 +262,13 @@ class Login(utils.Base):
             data=data,
         )
 
-        if 'account_name' not in json_data['response']:
+        response = json_data['response']
+
+        if 'account_name' not in response:
             return None
 
-        refresh_token = json_data['response']['refresh_token']
-        access_token = json_data['response']['access_token']
+        refresh_token = response['refresh_token']
+        access_token = response['access_token']
         sessionid = ''.join(random.choices('0123456789abcdef', k=24))
 
         data = {
@@ -270,7 +293,10 @@ class Login(utils.Base):
 
             transfer_info.append(TransferInfo(item['url'], data['nonce'], data['auth']))
 
-        return LoginData(steamid, client_id, sessionid, refresh_token, access_token, transfer_info)
+        # phoneajax needs the cookies set by transfer requests above
+        has_phone = await self.has_phone(sessionid) if check_phone else None
+
+        return LoginData(steamid, client_id, sessionid, refresh_token, access_token, transfer_info, has_phone)
 
     async def do_login(
             self,
@@ -278,6 +304,7 @@ class Login(utils.Base):
             auth_code: str = '',
             auth_code_type: AuthCodeType = AuthCodeType.device,
             mobile_login: bool = False,
+            check_phone: bool = False,
     ) -> LoginData:
         """
         Login a user on Steam
@@ -285,6 +312,7 @@ class Login(utils.Base):
         :param auth_code: optional auth code to login
         :param auth_code_type: auth code type
         :param mobile_login: True to request mobile session instead desktop one
+        :param check_phone: True to also check if user has a phone registered. See `LoginData.has_phone`
         :return: Updated `LoginData`
         """
         _original_fargs = locals().copy()
@@ -297,12 +325,14 @@ class Login(utils.Base):
             data=data,
         )
 
-        if 'steamid' not in json_data['response']:
+        response = json_data['response']
+
+        if 'steamid' not in response:
             raise LoginError('Unable to log-in. Check your username and password.')
 
-        client_id = json_data['response']['client_id']
-        request_id = json_data['response']['request_id']
-        steamid = json_data['response']['steamid']
+        client_id = response['client_id']
+        request_id = response['request_id']
+        steamid = response['steamid']
 
         if shared_secret:
             server_data = await self.request_json(f'{self.api_url}/ISteamWebAPIUtil/GetServerInfo/v1')
@@ -331,8 +361,9 @@ class Login(utils.Base):
             if not auth_data['response']:
                 raise TwoFactorCodeError('SteamGuard code is wrong', steamid, client_id, request_id)
         else:
-            captcha_requested = len(json_data['response']['allowed_confirmations']) > 1
-            auth_code_type = json_data['response']['allowed_confirmations'][0]['confirmation_type']
+            allowed_confirmations = response['allowed_confirmations']
+            captcha_requested = len(allowed_confirmations) > 1
+            auth_code_type = allowed_confirmations[0]['confirmation_type']
 
             if auth_code_type == 2:
                 raise MailCodeError("Mail code requested", captcha_requested)
@@ -349,7 +380,7 @@ class Login(utils.Base):
             if auth_code_type == 6:
                 raise CaptchaError("Captcha code requested")
 
-        login_data = await self.poll_login(steamid, client_id, request_id)
+        login_data = await self.poll_login(steamid, client_id, request_id, check_phone)
 
         if not login_data:
             raise LoginError('Tokens are not received. Try again.')
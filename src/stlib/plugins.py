@@ -29,7 +29,6 @@ if plugins.has_plugin('indiegala'):
 ```
 """
 import functools
-import glob
 import importlib.machinery
 import importlib.util
 import logging
@@ -41,21 +40,33 @@ import sys
 
 log = logging.getLogger(__name__)
 manager: '_Manager | None' = None
-default_search_paths: Tuple[str, ...]
+_PLUGIN_SUFFIXES = ('.py', '.pyc', '.pyd')
 
-if hasattr(sys, 'frozen') or os.name == 'nt':
-    default_search_paths = (
-        os.path.join(os.getcwd(), 'plugins'),
-        os.path.join(os.environ["LOCALAPPDATA"], 'stlib', 'plugins'),
-    )
-else:
-    default_search_paths = (
+
+@functools.cache
+def _default_search_paths() -> Tuple[str, ...]:
+    # computed on first use, so importing `plugins` doesn't touch the environment
+    if hasattr(sys, 'frozen') or os.name == 'nt':
+        return (
+            os.path.join(os.getcwd(), 'plugins'),
+            os.path.join(os.environ["LOCALAPPDATA"], 'stlib', 'plugins'),
+        )
+
+    return (
         os.path.join(os.getcwd(), 'plugins'),
         os.path.abspath(os.path.join(os.path.sep, 'usr', 'share', 'stlib', 'plugins')),
         os.path.join(os.environ['HOME'], '.local', 'share', 'stlib', 'plugins'),
     )
 
 
+def __getattr__(name: str) -> Any:
+    # `default_search_paths` used to be a module constant. Keep it readable as one
+    if name == 'default_search_paths':
+        return _default_search_paths()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class PluginError(Exception):
     """Base exception for plugin exceptions"""
     pass
@@ -72,8 +83,8 @@ class PluginLoaderError(PluginError):
 
 
 class _Manager:
-    def __init__(self, custom_search_paths: Tuple[str, ...] = ()) -> None:
-        self._module_search_paths = custom_search_paths + default_search_paths
+    def __init__(self, custom_search_paths: Tuple[str, ...] = (), strict: bool = False) -> None:
+        self._module_search_paths = custom_search_paths + _default_search_paths()
         self._plugins: Dict[str, ModuleType] = {}
 
         for plugin_directory in self._module_search_paths:
@@ -81,8 +92,12 @@ class _Manager:
                 log.debug("Unable to find plugin directory in:\n%s", plugin_directory)
                 continue
 
-            for full_path in glob.glob(os.path.join(plugin_directory, '*.py*')):
-                module_name = os.path.basename(full_path).split('.')[0]
+            for entry in os.scandir(plugin_directory):
+                if entry.name.startswith('.') or not entry.name.endswith(_PLUGIN_SUFFIXES):
+                    continue
+
+                full_path = entry.path
+                module_name = entry.name.split('.')[0]
                 log.debug("%s found at %s", module_name, full_path)
                 plugin_spec = importlib.util.spec_from_file_location(module_name, full_path)
                 assert isinstance(plugin_spec, importlib.machinery.ModuleSpec), "No module spec?"
@@ -90,8 +105,12 @@ class _Manager:
 
                 try:
                     plugin_spec.loader.exec_module(module_)  # type: ignore
-                except ImportError as exception:
-                    raise PluginLoaderError(exception) from exception
+                except Exception as exception:
+                    if strict:
+                        raise PluginLoaderError(exception) from exception
+
+                    log.warning("Skipping plugin %s: %r", module_name, exception)
+                    continue
 
                 log.debug("Plugin %s loaded.", module_name)
                 self._plugins[module_.__name__] = module_
@@ -120,17 +139,21 @@ def _plugin_manager(function: Callable[..., Any]) -> Callable[..., Any]:
         else:
             log.debug("Using existent plugin manager")
 
+        # manager is ready, so next calls can skip this wrapper entirely
+        globals()[function.__name__] = getattr(manager, function.__name__, function)
+
         return function(*args, **kwargs)
 
     return wrapper
 
 
-def add_search_paths(*paths: str) -> None:
+def add_search_paths(*paths: str, strict: bool = False) -> None:
     """
     Add `paths` to plugin search paths.
     Must be called before use any method from `plugins` module.
     The custom search paths will take precedence over default search paths.
     :param paths: The paths you want to include
+    :param strict: if True, raise `PluginLoaderError` when a plugin can't be loaded instead of skipping it
     :return: None
     """
     global manager
@@ -138,7 +161,7 @@ def add_search_paths(*paths: str) -> None:
     if manager:
         raise RuntimeError("Can't change search path after plugin manager initialization")
 
-    manager = _Manager(tuple(paths))
+    manager = _Manager(tuple(paths), strict)
 
 
 @_plugin_manager
@@ -28,29 +28,65 @@ import hmac
 import locale
 import logging
 import operator
-from functools import total_ordering, reduce
-from typing import NamedTuple, Type, Self, Tuple
+import re
+import struct
+from enum import IntEnum, StrEnum
+from functools import total_ordering, reduce, lru_cache, cached_property
+from typing import NamedTuple, Type, Self, Tuple, TYPE_CHECKING
 
 import rsa
 
+try:
+    from cryptography.hazmat.primitives.asymmetric import padding as _padding
+    from cryptography.hazmat.primitives.asymmetric import rsa as _rsa_backend
+except ImportError:
+    cryptography_available = False
+else:
+    cryptography_available = True
+    _PKCS1V15_PADDING = _padding.PKCS1v15()
+
+if TYPE_CHECKING:
+    import numpy
+    import numpy.typing
+
 log = logging.getLogger(__name__)
 
-__STEAM_ALPHABET = ['2', '3', '4', '5', '6', '7', '8', '9',
+__STEAM_ALPHABET = ('2', '3', '4', '5', '6', '7', '8', '9',
                     'B', 'C', 'D', 'F', 'G', 'H', 'J', 'K',
                     'M', 'N', 'P', 'Q', 'R', 'T', 'V', 'W',
-                    'X', 'Y']
+                    'X', 'Y')
+
+
+class SteamUniverse(StrEnum):
+    PUBLIC = 'DE45CD61'
+    """public universe"""
+    PRIVATE = '7DC60112'
+    """private universe"""
+    ALPHA = 'E77327FA'
+    """alpha universe"""
+
+
+class TokenType(IntEnum):
+    NONE = 0
+    """no token"""
+    MOBILEAPP = 1
+    """mobile app token"""
+    THIRDPARTY = 2
+    """third party token"""
+
+
+# kept for compatibility. Use `SteamUniverse` and `TokenType` instead
+STEAM_UNIVERSE = {member.name.lower(): member.value for member in SteamUniverse}
+TOKEN_TYPE = {member.name.lower(): member.value for member in TokenType}
 
-STEAM_UNIVERSE = {
-    'public': 'DE45CD61',
-    'private': '7DC60112',
-    'alpha': 'E77327FA',
-}
+_UINT64 = struct.Struct('>Q')
+_monetary_language_checked = False
+_NON_DIGITS_PATTERN = re.compile(r'\D')
 
-TOKEN_TYPE = {
-    'none': 0,
-    'mobileapp': 1,
-    'thirdparty': 2,
-}
+# STEAM*:type:id | [U:X:id3] | id64
+_STEAMID_PATTERN = re.compile(
+    r'\[?(?:STEAM\w*:\s*(?P<type>\d+)\s*:\s*(?P<id>\d+)|U:\d+:\s*(?P<id3>\d+))\s*\]?|(?P<id64>\d{17})'
+)
 
 
 class SteamKey(NamedTuple):
@@ -59,40 +95,63 @@ class SteamKey(NamedTuple):
     timestamp: int
     """Timestamp"""
 
+    def encrypt(self, message: bytes) -> bytes:
+        """
+        Encrypt `message` using PKCS#1 v1.5
+        If `cryptography` is installed, it's used instead of the pure python `rsa` implementation.
+        :param message: message to encrypt
+        :return: encrypted message
+        """
+        if not cryptography_available:
+            return rsa.encrypt(message, self.key)
 
-class SteamId(NamedTuple):
-    """Conversible steam ID"""
+        return _backend_public_key(self.key.n, self.key.e).encrypt(message, _PKCS1V15_PADDING)
+
+
+class _SteamIdFields(NamedTuple):
     type: int
     """Account type"""
     id: int
     """Account ID"""
 
+
+class SteamId(_SteamIdFields):
+    """Conversible steam ID"""
+    # no __slots__ here, so instances get a __dict__ to hold the cached properties
+    ID_BASE = 76561197960265728
+    """Base ID used to generate steam ID"""
+
     @classmethod
     def id_base(cls) -> int:
-        """Base ID used to generate steam ID"""
-        return 76561197960265728
+        """Base ID used to generate steam ID (same as `ID_BASE`)"""
+        return cls.ID_BASE
 
-    @property
+    @cached_property
     def id3(self) -> int:
         """Steam ID3"""
-        return (self.id + self.type) * 2 - self.type
+        return (self.id << 1) + self.type
 
-    @property
+    @cached_property
     def id64(self) -> int:
         """Steam ID64"""
-        return self.id_base() + (self.id * 2) + self.type
+        return self.ID_BASE + self.id3
+
+    @cached_property
+    def id64_str(self) -> str:
+        """Steam ID64 as string (as used in web api params)"""
+        return str(self.id64)
 
-    @property
+    @cached_property
     def id_string(self) -> str:
         """Steam ID as string"""
         return f"STEAM_0:{self.type}:{self.id}"
 
-    @property
+    @cached_property
     def id3_string(self) -> str:
         """Steam ID3 as string"""
         return f"[U:1:{self.id3}]"
 
-    @property
+    @cached_property
     def profile_url(self) -> str:
         """Profile url"""
         return f'https://steamcommunity.com/profiles/{self.id64}'
@@ -132,12 +191,14 @@ class SteamPrice:
 
     @staticmethod
     def __calc_fee(price: int) -> Tuple[int, int]:
-        return max(int(price * 0.10), 1), max(int(price * 0.05), 1)
+        return max(price // 10, 1), max(price // 20, 1)
 
     def __calc_price_offset(self, price: int) -> Tuple[int, int, int]:
-        steam_fee, dev_fee = self.__calc_fee(price)
-        # sourcery skip: use-assigned-variable
-        fixed_price = price
+        # price + fees is ~1.15 * price (fees are floored and at least 1 each),
+        # so the answer is at most (price + 1.85) / 1.15 and the loop below
+        # only needs a few steps to find it
+        fixed_price = min(price, (price * 100 + 185) // 115)
+        steam_fee, dev_fee = self.__calc_fee(fixed_price)
 
         while fixed_price + steam_fee + dev_fee > price:
             fixed_price -= 1
@@ -147,10 +208,17 @@ class SteamPrice:
 
     @staticmethod
     def __check_language() -> None:
+        global _monetary_language_checked
+
+        if _monetary_language_checked:
+            return
+
         if not locale.getlocale(locale.LC_MONETARY)[0]:
             locale_info = locale.getlocale()
             locale.setlocale(locale.LC_MONETARY, f"{locale_info[0]}.{locale_info[1]}")
 
+        _monetary_language_checked = True
+
     @staticmethod
     def get_language() -> str:
         """Get current language used to show monetary price"""
@@ -160,7 +228,10 @@ class SteamPrice:
     @staticmethod
     def set_language(value: str) -> None:
         """Set the language used to show monetary price"""
+        global _monetary_language_checked
+
         locale.setlocale(locale.LC_MONETARY, value)
+        _monetary_language_checked = False
 
     def fees(self, reverse: bool = False, as_integer: bool = False) -> Tuple[int | float, int | float, int | float]:
         """
@@ -228,10 +299,10 @@ class SteamPrice:
         """Create an instance using monetary price"""
         no_comma = price.replace(',', '.')
         price_list = no_comma.split('.')
-        big = ''.join(char for char in price_list[0] if char.isdigit())
+        big = _NON_DIGITS_PATTERN.sub('', price_list[0])
 
         if len(price_list) > 1:
-            minor = ''.join(char for char in price_list[1] if char.isdigit())
+            minor = _NON_DIGITS_PATTERN.sub('', price_list[1])
         else:
             minor = '0'
 
@@ -239,6 +310,89 @@ class SteamPrice:
 
         return cls(price_float)
 
+    @staticmethod
+    def bulk_calc_fee(
+            prices: 'numpy.typing.ArrayLike',
+    ) -> Tuple['numpy.typing.NDArray[numpy.int64]', 'numpy.typing.NDArray[numpy.int64]']:
+        """
+        Calculate fees for many integer prices at once (requires numpy)
+        :param prices: prices as integer (see `as_integer`)
+        :return: steam fees, dev fees
+        """
+        import numpy  # optional, and too heavy to import with universe
+
+        prices = numpy.asarray(prices, dtype=numpy.int64)
+        return numpy.maximum(prices // 10, 1), numpy.maximum(prices // 20, 1)
+
+    @classmethod
+    def bulk_calc_price_offset(
+            cls,
+            prices: 'numpy.typing.ArrayLike',
+    ) -> Tuple[
+        'numpy.typing.NDArray[numpy.int64]',
+        'numpy.typing.NDArray[numpy.int64]',
+        'numpy.typing.NDArray[numpy.int64]',
+    ]:
+        """
+        Same as `fees` with reverse and as_integer for many integer prices at once (requires numpy)
+        :param prices: prices as integer (see `as_integer`)
+        :return: price offsets, steam fees, dev fees
+        """
+        import numpy  # optional, and too heavy to import with universe
+
+        prices = numpy.asarray(prices, dtype=numpy.int64)
+        fixed_prices = numpy.minimum(prices, (prices * 100 + 185) // 115)
+        steam_fees, dev_fees = cls.bulk_calc_fee(fixed_prices)
+
+        while (over_price := fixed_prices + steam_fees + dev_fees > prices).any():
+            fixed_prices -= over_price
+            steam_fees, dev_fees = cls.bulk_calc_fee(fixed_prices)
+
+        return fixed_prices + steam_fees + dev_fees, steam_fees, dev_fees
+
+    @classmethod
+    def bulk_fees(
+            cls,
+            prices: 'numpy.typing.ArrayLike',
+            reverse: bool = False,
+    ) -> Tuple[
+        'numpy.typing.NDArray[numpy.int64]',
+        'numpy.typing.NDArray[numpy.int64]',
+        'numpy.typing.NDArray[numpy.int64]',
+    ]:
+        """
+        Same as `fees` with as_integer for many float prices at once (requires numpy)
+        :param prices: prices as float
+        :param reverse: if True subtract fees instead sum
+        :return: prices (or price offsets), steam fees, dev fees
+        """
+        import numpy  # optional, and too heavy to import with universe
+
+        integer_prices = numpy.rint(numpy.asarray(prices, dtype=numpy.float64) * 100).astype(numpy.int64)
+
+        if reverse:
+            return cls.bulk_calc_price_offset(integer_prices)
+
+        return integer_prices, *cls.bulk_calc_fee(integer_prices)
+
+
+# built once per key, so the OpenSSL key setup is shared by every encryption with it
+@lru_cache(maxsize=8)
+def _backend_public_key(modulus: int, exponent: int) -> '_rsa_backend.RSAPublicKey':
+    return _rsa_backend.RSAPublicNumbers(exponent, modulus).public_key()
+
+
+# sized for applications handling many accounts (shared + identity secret each)
+@lru_cache(maxsize=256)
+def _decode_secret(secret: str | bytes) -> bytes:
+    return base64.b64decode(secret)
+
+
+@lru_cache(maxsize=256)
+def _hmac_template(key: bytes) -> 'hmac.HMAC':
+    # keyed once, so each code only costs a copy instead of a new key schedule
+    return hmac.new(key, digestmod=hashlib.sha1)
+
 
 def generate_otp_code(msg: bytes, key: bytes) -> int:
     """
@@ -247,51 +401,69 @@ def generate_otp_code(msg: bytes, key: bytes) -> int:
     :param key: seed
     :return: OTP
     """
-    auth = hmac.new(key, msg, hashlib.sha1)
+    auth = _hmac_template(key).copy()
+    auth.update(msg)
     digest = auth.digest()
     start = digest[19] & 0xF
-    code = digest[start:start + 4]
 
-    return int.from_bytes(code, byteorder='big') & 0x7FFFFFFF
+    return (
+            (digest[start] & 0x7F) << 24
+            | digest[start + 1] << 16
+            | digest[start + 2] << 8
+            | digest[start + 3]
+    )
 
 
+@lru_cache(maxsize=256)
 def generate_otp_seed(shared_secret: str | bytes) -> str:
     """
     Generate OTP seed from user shared secret
     :param shared_secret: User shared secret
     :return: seed
     """
-    key = base64.b64decode(shared_secret)
+    key = _decode_secret(shared_secret)
     return base64.b32encode(key).decode()
 
 
-# noinspection PyUnboundLocalVariable
 def generate_steamid(steamid: str | int) -> SteamId:
     """
     Generate `SteamId` from any steam ID string or number
+    Accepted strings are `STEAM_X:type:id`, `[U:X:id3]` (brackets are optional)
+    and 17 digits ID64. Surrounding whitespace is ignored.
     :param steamid: Any steam ID format as string or number
     :return: `SteamId`
     """
     if isinstance(steamid, str):
-        steamid_parts = steamid.strip('[]').split(':')
-
-        if steamid_parts[0][:5] == 'STEAM':
-            type_ = int(steamid_parts[1])
-            id_ = int(steamid_parts[2])
-        elif steamid_parts[0][0] == 'U':
-            type_ = 0 if int(steamid_parts[2]) % 2 == 0 else 1
-            id_ = int((int(steamid_parts[2]) - type_) / 2)
-        elif steamid.isdigit() and len(steamid) == 17:
-            steamid = int(steamid)
-        else:
+        match = _STEAMID_PATTERN.fullmatch(steamid.strip())
+
+        if not match:
             raise ValueError('Invalid steamid')
 
-    if isinstance(steamid, int):
-        offset = steamid - SteamId.id_base()
-        type_ = 0 if offset % 2 == 0 else 1
-        id_ = int((offset - type_) / 2)
+        if match['id']:
+            return SteamId(int(match['type']), int(match['id']))
+
+        if match['id3']:
+            id3 = int(match['id3'])
+            return SteamId(id3 & 1, id3 >> 1)
+
+        steamid = int(match['id64'])
 
-    return SteamId(type_, id_)
+    offset = steamid - SteamId.ID_BASE
+    return SteamId(offset & 1, offset >> 1)
+
+
+def bulk_generate_steamid(
+        steamids: 'numpy.typing.ArrayLike',
+) -> Tuple['numpy.typing.NDArray[numpy.int8]', 'numpy.typing.NDArray[numpy.int64]']:
+    """
+    Same as `generate_steamid` for many steam ID64 numbers at once (requires numpy)
+    :param steamids: steam ID64 numbers
+    :return: account types, account IDs
+    """
+    import numpy  # optional, and too heavy to import with universe
+
+    offsets = numpy.asarray(steamids, dtype=numpy.int64) - SteamId.ID_BASE
+    return (offsets & 1).astype(numpy.int8), offsets >> 1
 
 
 def generate_steam_code(server_time: int, shared_secret: str | bytes) -> str:
@@ -301,16 +473,20 @@ def generate_steam_code(server_time: int, shared_secret: str | bytes) -> str:
     :param shared_secret: User shared secret
     :return: Steam OTP
     """
-    msg = (server_time // 30).to_bytes(8, 'big')
-    key = base64.b64decode(shared_secret)
+    msg = _UINT64.pack(server_time // 30)
+    key = _decode_secret(shared_secret)
     auth_code_raw = generate_otp_code(msg, key)
 
-    auth_code = []
-    for _ in range(5):
-        auth_code.append(__STEAM_ALPHABET[int(auth_code_raw % len(__STEAM_ALPHABET))])
-        auth_code_raw //= len(__STEAM_ALPHABET)
+    alphabet = __STEAM_ALPHABET
+
+    # base 26, least significant digit first
+    auth_code_raw, first = divmod(auth_code_raw, 26)
+    auth_code_raw, second = divmod(auth_code_raw, 26)
+    auth_code_raw, third = divmod(auth_code_raw, 26)
+    auth_code_raw, fourth = divmod(auth_code_raw, 26)
+    fifth = auth_code_raw % 26
 
-    return ''.join(auth_code)
+    return alphabet[first] + alphabet[second] + alphabet[third] + alphabet[fourth] + alphabet[fifth]
 
 
 def generate_device_id(base: str) -> str:
@@ -319,20 +495,20 @@ def generate_device_id(base: str) -> str:
     :param base: Base string
     :return: Device ID
     """
-    digest = hashlib.sha256(base.encode()).hexdigest()
-    device_id = ['android:']
-
-    for start, end in ([0, 8], [8, 12], [12, 16], [16, 20], [20, 32]):
-        device_id.extend((digest[start:end], '-'))
-    device_id.pop(-1)
-    return ''.join(device_id)
+    # it's only an identifier, so FIPS-restricted builds can still compute it
+    digest = hashlib.sha256(base.encode(), usedforsecurity=False).hexdigest()
+    return f"android:{digest[0:8]}-{digest[8:12]}-{digest[12:16]}-{digest[16:20]}-{digest[20:32]}"
 
 
 def generate_time_hash(server_time: int, tag: str, secret: str) -> str:
     """Generate steam time hash"""
-    key = base64.b64decode(secret)
-    msg = server_time.to_bytes(8, 'big') + tag.encode()
-    auth = hmac.new(key, msg, hashlib.sha1)
+    key = _decode_secret(secret)
+    tag_bytes = tag.encode()
+    msg = bytearray(8 + len(tag_bytes))
+    _UINT64.pack_into(msg, 0, server_time)
+    msg[8:] = tag_bytes
+    auth = _hmac_template(key).copy()
+    auth.update(msg)
     code = base64.b64encode(auth.digest())
 
     return code.decode()
@@ -340,11 +516,11 @@ def generate_time_hash(server_time: int, tag: str, secret: str) -> str:
 
 def encrypt_password(steam_key: SteamKey, password: str) -> bytes:
     """
-    Encrypt user password
+    Encrypt user password (PKCS#1 v1.5). See `SteamKey.encrypt`
     :param steam_key: `SteamKey`
     :param password: Raw user password
     :return: Encrypted password
     """
-    encrypted_password = rsa.encrypt(password.encode(), steam_key.key)
+    encrypted_password = steam_key.encrypt(password.encode())
 
     return base64.b64encode(encrypted_password)
@@ -23,15 +23,132 @@ import asyncio
 import atexit
 import contextlib
 import http.cookies
+import importlib.util
 import json
 import logging
-from typing import Dict, Any, NamedTuple, Self
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, NamedTuple, Self, Tuple, Iterable, List, Coroutine
 
 import aiohttp
 from bs4 import BeautifulSoup
 
+try:
+    import orjson
+except ImportError:
+    orjson_available = False
+else:
+    orjson_available = True
+
+# aiohttp imports it by itself, so it's only needed to know if it's installed
+aiodns_available = importlib.util.find_spec('aiodns') is not None
+
 log = logging.getLogger(__name__)
-_session_cache: Dict[str, Dict[int, 'aiohttp.ClientSession | Base']] = {'http_session': {}}
+# both accept bytes, so responses can be parsed without decoding them first
+_json_loads = orjson.loads if orjson_available else json.loads
+# used to decode json objects embedded in javascript code
+_json_decoder = json.JSONDecoder()
+# libxml2 is much faster than the pure python parser on Steam pages
+HTML_PARSER = 'lxml'
+# script contents are raw text, so they can be taken without building a html tree.
+# comments are matched too, so scripts commented out are skipped like the html parser does
+_SCRIPT_PATTERN = re.compile(r'<!--.*?-->|<script[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+# keyed by class object and session index, so lookups don't need to build names
+_instance_cache: Dict[Tuple[type, int], 'Base'] = {}
+_http_session_cache: Dict[int, aiohttp.ClientSession] = {}
+# connection pool shared by every http session (cookies still belong to each session)
+_shared_connector: Tuple[asyncio.AbstractEventLoop, aiohttp.TCPConnector] | None = None
+
+
+def _get_shared_connector() -> aiohttp.TCPConnector:
+    global _shared_connector
+    loop = asyncio.get_running_loop()
+    shared_connector = _shared_connector
+
+    if shared_connector and shared_connector[0] is loop and not shared_connector[1].closed:
+        return shared_connector[1]
+
+    log.debug("Creating a new shared connector")
+    # resolve without blocking a thread per lookup when possible
+    resolver = aiohttp.AsyncResolver() if aiodns_available else None
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=20,
+        resolver=resolver,
+        ttl_dns_cache=600,
+        keepalive_timeout=75,
+    )
+    _shared_connector = loop, connector
+
+    return connector
+
+
+async def _close_shared_connector() -> None:
+    global _shared_connector
+    shared_connector = _shared_connector
+
+    if shared_connector:
+        log.debug("Closing shared connector")
+        _shared_connector = None
+        await shared_connector[1].close()
+
+
+_JSON_CACHE_SIZE = 1024
+_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# methods that can be sent again when the connection drops mid request
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD'})
+# longest delay honoured from a Retry-After header, in seconds
+_MAX_RETRY_AFTER = 60
+
+
+def _retry_delay(attempt: int) -> float:
+    # exponential backoff (capped at 5 seconds) with jitter, so concurrent retries don't hit the server together.
+    # the exponent is capped too, as retries can go on forever and a huge power overflows float
+    return min(5.0, 0.25 * 2.0 ** min(attempt, 5)) + random.random() * 0.25
+
+
+class _TokenBucket:
+    """Allow up to `rate` requests every `per` seconds, refilling continuously"""
+
+    def __init__(self, rate: int, per: float) -> None:
+        if rate <= 0 or per <= 0:
+            raise ValueError(f"Invalid rate limit: {rate} requests every {per} seconds")
+
+        self._rate = rate
+        self._per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate / self._per)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self._per / self._rate)
+
+
+@atexit.register
+def _close_http_sessions() -> None:
+    # one event loop for every session left open, instead of one per session
+    http_sessions = [http_session for http_session in _http_session_cache.values() if not http_session.closed]
+
+    if not http_sessions and not _shared_connector:
+        return
+
+    async def close_all() -> None:
+        await asyncio.gather(*[http_session.close() for http_session in http_sessions])
+        await _close_shared_connector()
+
+    asyncio.run(close_all())
 
 
 class Response(NamedTuple):
@@ -42,7 +159,7 @@ class Response(NamedTuple):
     cookies: http.cookies.SimpleCookie
     """Cookies"""
     content: str | bytes
-    """Content as string"""
+    """Content as string (or bytes, when requested with `raw_data`)"""
     content_type: str
     """Content type"""
 
@@ -60,17 +177,22 @@ class Base:
             "Use get_session(<index>) to support multiple sessions."
         )
 
-    def __init__(self, http_session: aiohttp.ClientSession | None = None, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+            self,
+            http_session: aiohttp.ClientSession | None = None,
+            *args: Any,
+            max_concurrency: int = 20,
+            json_cache_ttl: float = 0,
+            rate_limit: Tuple[int, float] | None = None,
+            **kwargs: Any,
+    ) -> None:
         self._http_session = http_session
-
-    @staticmethod
-    def _close_http_session(http_session: aiohttp.ClientSession) -> None:
-        coro = http_session.close()
-
-        try:
-            asyncio.create_task(coro)
-        except RuntimeError:
-            asyncio.run(coro)
+        self._rate_limiter = _TokenBucket(*rate_limit) if rate_limit else None
+        # backpressure for large bursts of requests, so they don't pile up in the connector
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+        self._json_cache_ttl = json_cache_ttl
+        # (url, params) -> (monotonic time, raw json), least recently used first
+        self._json_cache: OrderedDict[Tuple[str, Tuple[Any, ...]], Tuple[float, bytes]] = OrderedDict()
 
     @property
     def http_session(self) -> aiohttp.ClientSession:
@@ -94,6 +216,9 @@ class Base:
         """
         Create a http session at given `session_index`.
         If a previous instance exists in cache at same index, it will raise IndexError.
+        Unless a custom `connector` is given, all http sessions share one keep-alive
+        connection pool, so create sessions once and reuse them instead of creating
+        a new one for each request.
 
         :param session_index: Session number
         :param raise_for_status: Raise if the response status is 400 or higher.
@@ -101,18 +226,26 @@ class Base:
         :param kwargs: extra kwargs when creating a new http session
         :return: Instance of module
         """
-        if session_index in _session_cache['http_session']:
+        if session_index in _http_session_cache:
             raise IndexError(f"There's already a http_session session at index {session_index}")
 
         if 'headers' not in kwargs:
             kwargs['headers'] = {'User-Agent': 'Unknown/0.0.0'}
 
+        if 'connector' not in kwargs:
+            # keep connections alive between requests, even from different sessions
+            kwargs['connector'] = _get_shared_connector()
+            kwargs['connector_owner'] = False
+
+        if 'timeout' not in kwargs:
+            # fail fast on unreachable hosts, so auto recovery can try again sooner
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=300, sock_connect=10)
+
         log.info("Creating a new http session at index %s for custom http session", session_index)
         http_session = aiohttp.ClientSession(*args, raise_for_status=raise_for_status, **kwargs)
-        _session_cache['http_session'][session_index] = http_session
+        _http_session_cache[session_index] = http_session
 
         assert isinstance(http_session, aiohttp.ClientSession), "Wrong session type"
-        atexit.register(cls._close_http_session, http_session)
         return http_session
 
     @classmethod
@@ -129,29 +262,33 @@ class Base:
         :param session_index: Session number
         :param args: extra args when creating a new instance
         :param kwargs: extra kwargs when creating a new instance
+            (`max_concurrency` limits in-flight requests for this instance, default 20)
+            (`json_cache_ttl` caches `request_json` GET responses for that many seconds, default 0: no cache)
+            (`rate_limit` as (requests, seconds) limits request rate for this instance, default unlimited)
         :return: Instance of module
         """
-        cache_name = f'{cls.__module__}.{cls.__name__}'
+        cache_key = (cls, session_index)
 
-        if cache_name not in _session_cache:
-            log.debug("Creating a new cache object at %s for %s", session_index, cache_name)
-            _session_cache[cache_name] = {}
-
-        if session_index in _session_cache['http_session']:
-            log.info("Reusing http session at index %s for %s", session_index, cache_name)
-            http_session = _session_cache['http_session'][session_index]
+        if session_index in _http_session_cache:
+            log.info("Reusing http session at index %s for %s", session_index, cls.__qualname__)
+            http_session = _http_session_cache[session_index]
         else:
             http_session = await cls.new_http_session(session_index)
-            _session_cache['http_session'][session_index] = http_session
 
-        if session_index in _session_cache[cache_name]:
-            raise IndexError(f"There's already a {cache_name} session at index {session_index}")
+        if cache_key in _instance_cache:
+            raise IndexError(f"There's already a {cls.__module__}.{cls.__name__} session at index {session_index}")
+
+        log.info("Creating a new %s session at %s", cls.__qualname__, session_index)
+        session = _instance_cache[cache_key] = super().__new__(cls)
 
-        log.info("Creating a new %s session at %s", cache_name, session_index)
-        session = _session_cache[cache_name][session_index] = super().__new__(cls)
+        log.debug("Initializing instance for %s", cls.__qualname__)
 
-        log.debug("Initializing instance for %s", cache_name)
-        session.__init__(http_session=http_session, *args, **kwargs)  # type: ignore
+        try:
+            session.__init__(http_session=http_session, *args, **kwargs)  # type: ignore
+        except Exception:
+            # don't leave a half initialized instance behind at this index
+            del _instance_cache[cache_key]
+            raise
 
         assert isinstance(session, Base), "Wrong session type"
         return session
@@ -164,14 +301,14 @@ class Base:
         :param session_index: Session number
         :param no_fail: suppress errors if there is no session at given index
         """
-        cache_name = f'{cls.__module__}.{cls.__name__}'
-
-        if cache_name in _session_cache and session_index in _session_cache[cache_name]:
-            del _session_cache[cache_name][session_index]
-            http_session = _session_cache['http_session'][session_index]
+        if (cls, session_index) in _instance_cache:
+            del _instance_cache[cls, session_index]
+            http_session = _http_session_cache.pop(session_index)
             assert isinstance(http_session, aiohttp.ClientSession), "Wrong http session type"
             await http_session.close()
-            del _session_cache['http_session'][session_index]
+
+            if not _http_session_cache:
+                await _close_shared_connector()
         elif not no_fail:
             raise IndexError(f"There's no session at {session_index}")
 
@@ -184,17 +321,16 @@ class Base:
         :param session_index: session number
         :return: instance of module
         """
-        cache_name = f'{cls.__module__}.{cls.__name__}'
-
-        if cache_name not in _session_cache or session_index not in _session_cache[cache_name]:
-            raise IndexError(f"There's no session for {cache_name} at {session_index}")
+        try:
+            session = _instance_cache[cls, session_index]
+        except KeyError:
+            raise IndexError(f"There's no session for {cls.__module__}.{cls.__name__} at {session_index}") from None
 
-        session = _session_cache[cache_name][session_index]
         assert isinstance(session, Base), "Wrong session type"
         return session
 
     @staticmethod
-    def get_json_from_js_func(javascript: BeautifulSoup, target: str, separator: str = '\t+') -> Dict[str, Any]:
+    def get_json_from_js_func(javascript: BeautifulSoup | str, target: str, separator: str = '\t+') -> Dict[str, Any]:
         """
         get json data from javascript functions
         :param javascript: javascript parsed with data. Usually contents of a ''script''  tag
@@ -202,22 +338,28 @@ class Base:
         :param separator: delimiter string where to split data while parsing
         :return: json data
         """
+        javascript = str(javascript)
+
+        # most scripts don't call target at all, so skip splitting them
+        if target not in javascript:
+            return {}
+
         json_data = {}
-        for line in str(javascript).split(separator):
+        for line in javascript.split(separator):
             if target in line:
-                for item in line.split(','):
-                    with contextlib.suppress(ValueError):
-                        key_raw, value_raw = item.split(':"')
-                        key = key_raw.replace('"', '')
-                        value = bytes(value_raw.replace('"', ''), 'utf-8').decode('unicode_escape')
-                        json_data[key] = value
+                # only the top-level keys of the object literal passed to target are
+                # relevant, so decode it whole instead of matching nested pairs
+                with contextlib.suppress(ValueError):
+                    start = line.index('{', line.index(target))
+                    object_, _ = _json_decoder.raw_decode(line, start)
+                    json_data = {key: value for key, value in object_.items() if isinstance(value, str)}
 
                 break
 
         return json_data
 
     @staticmethod
-    def get_vars_from_js(javascript: BeautifulSoup, separator: str = '\n') -> Dict[str, Any]:
+    def get_vars_from_js(javascript: BeautifulSoup | str, separator: str = '\n') -> Dict[str, Any]:
         """
         get variables and it's values from javascript
         :param javascript: javascript parsed with data. Usually contents of a ''script'' tag
@@ -235,25 +377,112 @@ class Base:
 
         return vars_data
 
+    @staticmethod
+    def get_scripts(html: str) -> List[str]:
+        """
+        get contents of all script tags from html
+        :param html: html as string
+        :return: a list with javascript of each script
+        """
+        return [match.group(1) for match in _SCRIPT_PATTERN.finditer(html) if match.group(1) is not None]
+
     @staticmethod
     async def get_html(response: Response) -> BeautifulSoup:
         """
         get html parsed from response
         It's a convenient helper for `request`
+        :param response: `Response`
+        :return: parsed html
         """
-        return BeautifulSoup(response.content, 'html.parser')
+        return BeautifulSoup(response.content, HTML_PARSER)
 
-    async def request_json(self, *args: str, **kwargs: Any) -> Dict[str, Any]:
+    async def request_json(self, *args: str, cache_ttl: float | None = None, **kwargs: Any) -> Dict[str, Any]:
         """
         make a new http request and returns json data
         It's a convenient helper for `request`
+
+        Successful GET responses can be cached for `cache_ttl` seconds (defaults to
+        `json_cache_ttl` given when creating the session, which is 0: no cache).
+        Cache doesn't follow http cache-control headers, so only use it for data
+        that is fine to be outdated for up to `cache_ttl` seconds.
+
+        :param args: request args
+        :param cache_ttl: how long a cached response is valid, in seconds
+        :param kwargs: request kwargs
+        :return: json data as Dict
         """
+        if cache_ttl is None:
+            cache_ttl = self._json_cache_ttl
+
+        cache_key = None
+
+        if cache_ttl > 0 and not kwargs.get('data') and kwargs.get('http_method', 'GET') == 'GET':
+            url = args[0] if args else kwargs['url']
+            cache_key = url, tuple(sorted((kwargs.get('params') or {}).items()))
+
+            if cache_key in self._json_cache:
+                timestamp, content = self._json_cache[cache_key]
+
+                if time.monotonic() - timestamp < cache_ttl:
+                    self._json_cache.move_to_end(cache_key)
+                    return self._loads_json_dict(content)
+
+        kwargs['raw_data'] = True
         response = await self.request(*args, **kwargs)
-        json_data = json.loads(response.content)
+        json_data = self._loads_json_dict(response.content)
+
+        if cache_key and 200 <= response.status <= 299:
+            assert isinstance(response.content, bytes), "json response is not bytes"
+            self._json_cache[cache_key] = time.monotonic(), response.content
+            self._json_cache.move_to_end(cache_key)
+
+            if len(self._json_cache) > _JSON_CACHE_SIZE:
+                self._json_cache.popitem(last=False)
 
+        return json_data
+
+    @staticmethod
+    def _loads_json_dict(content: str | bytes) -> Dict[str, Any]:
+        # cached responses are stored raw, so callers can't change each other's data
+        json_data = _json_loads(content)
         assert isinstance(json_data, dict)
         return json_data
 
+    @staticmethod
+    async def _run_concurrently(coroutines: Iterable[Coroutine[Any, Any, Any]]) -> List[Any]:
+        # like asyncio.gather, but the other tasks are cancelled as soon as one of them fails.
+        # the first error is raised as is, so callers keep handling the same exceptions
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [task_group.create_task(coroutine) for coroutine in coroutines]
+        except ExceptionGroup as exception_group:
+            raise exception_group.exceptions[0] from None
+
+        return [task.result() for task in tasks]
+
+    async def request_many(self, urls: Iterable[str], **kwargs: Any) -> List[Response]:
+        """
+        make many http requests concurrently
+        If any request fails, the others are cancelled and errors are raised in an `ExceptionGroup`
+        :param urls: URLs to request
+        :param kwargs: request kwargs, used for all requests
+        :return: list of `Response` in same order as `urls`
+        """
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(self.request(url, **kwargs)) for url in urls]
+
+        return [task.result() for task in tasks]
+
+    async def request_json_many(self, urls: Iterable[str], **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        make many http requests concurrently and returns json data
+        It's a convenient helper for `request_many`
+        """
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(self.request_json(url, **kwargs)) for url in urls]
+
+        return [task.result() for task in tasks]
+
     async def request_json_from_js_func(
             self,
             *args: str,
@@ -272,8 +501,7 @@ class Base:
         :param kwargs: request kwargs
         :return: json_data as Dict
         """
-        html = await self.request_html(*args, **kwargs)
-        javascript = html.find_all('script')[script_index]
+        javascript = await self.request_script(*args, script_index=script_index, **kwargs)
         return self.get_json_from_js_func(javascript, target, separator)
 
     async def request_vars_from_js(
@@ -292,15 +520,32 @@ class Base:
         :param kwargs: request kwargs
         :return: vars_data as Dict
         """
-        html = await self.request_html(*args, **kwargs)
-        javascript = html.find_all('script')[script_index]
+        javascript = await self.request_script(*args, script_index=script_index, **kwargs)
         return self.get_vars_from_js(javascript, separator)
 
+    async def request_script(self, *args: str, script_index: int = 0, **kwargs: Any) -> str:
+        """
+        make a new http request and returns the contents of script at given index
+        It's a convenient helper for `request`
+        :param args: request args
+        :param script_index: index of script at html page
+        :param kwargs: request kwargs
+        :return: javascript as string
+        """
+        response = await self.request(*args, **kwargs)
+        assert isinstance(response.content, str), "script response is not str"
+        return self.get_scripts(response.content)[script_index]
+
     async def request_html(self, *args: str, **kwargs: Any) -> BeautifulSoup:
         """
         make a new http request and returns html
         It's a convenient helper for `request`
+        :param args: request args
+        :param kwargs: request kwargs
+        :return: parsed html
         """
+        # the parser handles the encoding itself, so skip decoding the body here
+        kwargs['raw_data'] = True
         response = await self.request(*args, **kwargs)
         return await self.get_html(response)
 
@@ -326,26 +571,21 @@ class Base:
         :param kwargs: Extra kwargs passed directly to http request
         :return: `Request`
         """
-        if not params:
-            params = {}
-
         if data:
             http_method = 'POST'
 
-        request_params: Dict[str, Any] = {
-            'method': http_method,
-            'url': url,
-            'params': params,
-            'data': data,
-            **kwargs,
-        }
-
         log.debug("Requesting %s via %s with %s:%s", url, http_method, params, data)
         try_count = 0
+        attempt = 0
 
         while True:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
+
             try:
-                async with self.http_session.request(**request_params) as response:
+                async with self._request_semaphore, self.http_session.request(
+                        http_method, url, params=params, data=data, **kwargs,
+                ) as response:
                     if len(response.history) >= 1:
                         location = response.history[0].headers['Location']
                     else:
@@ -363,25 +603,46 @@ class Base:
                         response.content_type,
                     )
                     break
-            except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as exception:
+            except (
+                    aiohttp.ClientConnectorError,
+                    aiohttp.ServerDisconnectedError,
+                    aiohttp.ClientPayloadError,
+                    asyncio.TimeoutError,
+            ) as exception:
                 log.debug("Connector error %s", str(exception))
 
-                if auto_recovery:
-                    log.debug("Trying again in 5 seconds")
-                    await asyncio.sleep(5)
+                # the server may have already processed the request when the connection
+                # is dropped, so it's only safe to send it again when it has no side effects
+                retriable = http_method in _IDEMPOTENT_METHODS or not isinstance(
+                    exception, (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError),
+                )
+
+                if auto_recovery and retriable:
+                    delay = _retry_delay(attempt)
+                    log.debug("Trying again in %.2f seconds", delay)
+                    await asyncio.sleep(delay)
+                    attempt += 1
                     continue
 
                 raise exception from None
             except aiohttp.ClientResponseError as exception:
                 log.debug("Response error %s", exception.status)
 
-                if 400 <= exception.status <= 499:
+                if exception.status not in _RETRY_STATUSES:
                     raise exception from None
 
                 if auto_recovery and try_count < 3:
-                    log.debug("Auto recovering in 5 seconds")
-                    await asyncio.sleep(5)
+                    delay = _retry_delay(attempt)
+
+                    if exception.headers and 'Retry-After' in exception.headers:
+                        # clamped, so a bogus header can't stall the request for hours
+                        with contextlib.suppress(ValueError):
+                            delay = min(max(delay, int(exception.headers['Retry-After'])), _MAX_RETRY_AFTER)
+
+                    log.debug("Auto recovering in %.2f seconds", delay)
+                    await asyncio.sleep(delay)
                     try_count += 1
+                    attempt += 1
                     continue
 
                 raise exception from None
@@ -21,14 +21,14 @@
 """
 
 import logging
-from typing import Any, Dict, List, NamedTuple
-
-import aiohttp
 import time
+from typing import Any, Dict, List, NamedTuple, Tuple, Type
 
 from . import universe, utils
 
 log = logging.getLogger(__name__)
+# profile data rarely changes, so repeated lookups can be served from cache
+_PROFILE_CACHE_TTL = 300
 
 
 class Game(NamedTuple):
@@ -48,6 +48,23 @@ class Game(NamedTuple):
     """True if game has workshop"""
 
 
+class PlayerSummary(NamedTuple):
+    steamid: universe.SteamId
+    """`SteamId`"""
+    personaname: str
+    """Persona name"""
+    profileurl: str
+    """Profile url (custom url if available)"""
+    avatar: str
+    """Avatar image (32x32)"""
+    avatarfull: str
+    """Avatar image (184x184)"""
+    personastate: int
+    """Persona state (0 when offline or private)"""
+    communityvisibilitystate: int
+    """Community visibility state (1 private, 3 public)"""
+
+
 class AuthenticatorData(NamedTuple):
     shared_secret: str
     """shared secret"""
@@ -89,6 +106,14 @@ class SMSCodeError(ValueError):
     pass
 
 
+# AddAuthenticator status -> (exception, message)
+_NEW_AUTHENTICATOR_ERRORS: Dict[int, Tuple[Type[Exception], str]] = {
+    29: (AuthenticatorExists, 'An Authenticator is already active for that account.'),
+    84: (PhoneNotRegistered, 'Phone not registered on Steam Account.'),
+    2: (PhoneNotRegistered, 'Phone not registered on Steam Account.'),
+}
+
+
 class SteamWebAPI(utils.Base):
     def __init__(
             self,
@@ -110,39 +135,102 @@ class SteamWebAPI(utils.Base):
         super().__init__(**kwargs)
         self.api_url = api_url
         self.api_key = api_key
+        # local time - server time, from the last `get_server_time`
+        self._time_offset: int | None = None
 
     @staticmethod
-    async def _new_mobile_data(
+    def _new_mobile_data(
             steamid: universe.SteamId,
-            token_type: str = 'mobileapp',
+            token_type: universe.TokenType = universe.TokenType.MOBILEAPP,
     ) -> Dict[str, Any]:
-        current_time = int(time.time())
-
         return {
             'steamid': steamid.id64,
-            'authenticator_time': current_time,
-            'authenticator_type': universe.TOKEN_TYPE[token_type],
+            'authenticator_time': int(time.time()),
+            'authenticator_type': int(token_type),
         }
 
     async def get_server_time(self) -> int:
         """Get server time"""
         json_data = await self.request_json(f'{self.api_url}/ISteamWebAPIUtil/GetServerInfo/v1')
         log.debug("server time found: %s", json_data['servertime'])
-        return int(json_data['servertime'])
+        server_time = int(json_data['servertime'])
+        self._time_offset = int(time.time()) - server_time
+        return server_time
 
-    async def get_custom_profile_url(self, steamid: universe.SteamId) -> str:
+    async def get_player_summary(
+            self,
+            steamid: universe.SteamId,
+            cache_ttl: float = _PROFILE_CACHE_TTL,
+    ) -> PlayerSummary:
         """
-        Get custom profile url
+        Get player summary from `SteamId`
         :param steamid: `SteamId`
-        :return: custom profile url as string
+        :param cache_ttl: how long a cached summary can be reused, in seconds (0 disables the cache)
+        :return: `PlayerSummary`
         """
-        params = {'steamids': str(steamid.id64), 'key': self.api_key}
-        json_data = await self.request_json(f'{self.api_url}/ISteamUser/GetPlayerSummaries/v2', params=params)
+        params = {'steamids': steamid.id64_str, 'key': self.api_key}
+        json_data = await self.request_json(
+            f'{self.api_url}/ISteamUser/GetPlayerSummaries/v2',
+            params=params,
+            cache_ttl=cache_ttl,
+        )
 
         if not json_data['response']['players']:
-            raise ValueError('Failed to get profile url.')
+            raise ValueError('Failed to get player summary.')
+
+        return self._new_player_summary(json_data['response']['players'][0])
+
+    async def get_player_summaries(
+            self,
+            steamids: List[universe.SteamId],
+            cache_ttl: float = _PROFILE_CACHE_TTL,
+    ) -> List[PlayerSummary]:
+        """
+        Get player summaries for many `SteamId` at once
+        Steam accepts up to 100 steamids per request, so larger lists are split and requested concurrently
+        :param steamids: list of `SteamId`
+        :param cache_ttl: how long cached summaries can be reused, in seconds (0 disables the cache)
+        :return: list of `PlayerSummary` (in no particular order, without steamids that weren't found)
+        """
+        params_list = [
+            {'steamids': ','.join(steamid.id64_str for steamid in steamids[index:index + 100]), 'key': self.api_key}
+            for index in range(0, len(steamids), 100)
+        ]
+
+        json_list = await self._run_concurrently(
+            self.request_json(
+                f'{self.api_url}/ISteamUser/GetPlayerSummaries/v2',
+                params=params,
+                cache_ttl=cache_ttl,
+            )
+            for params in params_list
+        )
+
+        return [
+            self._new_player_summary(player)
+            for json_data in json_list
+            for player in json_data['response']['players']
+        ]
 
-        profile_url = str(json_data['response']['players'][0]['profileurl'])
+    @staticmethod
+    def _new_player_summary(player: Dict[str, Any]) -> PlayerSummary:
+        return PlayerSummary(
+            universe.generate_steamid(player['steamid']),
+            player['personaname'],
+            player['profileurl'],
+            player['avatar'],
+            player['avatarfull'],
+            int(player['personastate']),
+            int(player['communityvisibilitystate']),
+        )
+
+    async def get_custom_profile_url(self, steamid: universe.SteamId) -> str:
+        """
+        Get custom profile url
+        :param steamid: `SteamId`
+        :return: custom profile url as string
+        """
+        profile_url = (await self.get_player_summary(steamid)).profileurl
         log.debug("profile url found: %s (from %s)", profile_url, steamid.id_string)
         return profile_url
 
@@ -153,7 +241,11 @@ class SteamWebAPI(utils.Base):
         :return: `SteamId`
         """
         params = {'vanityurl': custom_profile_url.split('/')[4], 'key': self.api_key}
-        json_data = await self.request_json(f'{self.api_url}/ISteamUser/ResolveVanityURL/v1', params=params)
+        json_data = await self.request_json(
+            f'{self.api_url}/ISteamUser/ResolveVanityURL/v1',
+            params=params,
+            cache_ttl=_PROFILE_CACHE_TTL,
+        )
 
         if json_data['response']['success'] != 1:
             raise ValueError('Failed to get user id.')
@@ -167,13 +259,7 @@ class SteamWebAPI(utils.Base):
         :param steamid: `SteamId`
         :return: Persona name as string
         """
-        params = {'steamids': str(steamid.id64), 'key': self.api_key}
-        json_data = await self.request_json(f'{self.api_url}/ISteamUser/GetPlayerSummaries/v2', params=params)
-
-        if not json_data['response']['players']:
-            raise ValueError('Failed to get personaname.')
-
-        nickname = str(json_data['response']['players'][0]['personaname'])
+        nickname = (await self.get_player_summary(steamid)).personaname
         log.debug("personaname found: %s (from %s)", nickname, steamid.id_string)
         return nickname
 
@@ -190,7 +276,7 @@ class SteamWebAPI(utils.Base):
         :return: List of `Game`
         """
         params = {
-            'steamid': str(steamid.id64),
+            'steamid': steamid.id64_str,
             'include_appinfo': "1",
             'include_extended_appinfo': "1",
             'skip_unvetted_apps': "0",
@@ -198,27 +284,25 @@ class SteamWebAPI(utils.Base):
         }
 
         if appids_filter:
-            for index, appid in enumerate(appids_filter):
-                params[f"appids_filter[{index}]"] = str(appid)
+            params.update({f"appids_filter[{index}]": str(appid) for index, appid in enumerate(appids_filter)})
 
         json_data = await self.request_json(f'{self.api_url}/IPlayerService/GetOwnedGames/v1', params=params)
-        games = []
 
         if 'games' not in json_data['response']:
             raise ValueError('Failed to get owned games.')
 
-        for game in json_data['response']['games']:
-            game_params = {
-                'name': game['name'],
-                'appid': game['appid'],
-                'playtime_forever': game['playtime_forever'],
-                'img_icon_url': game['img_icon_url'],
-                'has_dlc': game['has_dlc'],
-                'has_market': game['has_market'],
-                'has_workshop': game['has_workshop'],
-            }
-
-            games.append(Game(**game_params))
+        games = [
+            Game(
+                game['name'],
+                game['appid'],
+                game['playtime_forever'],
+                game['img_icon_url'],
+                game['has_dlc'],
+                game['has_market'],
+                game['has_workshop'],
+            )
+            for game in json_data['response']['games']
+        ]
 
         log.debug("%s owned games found.", json_data['response']['game_count'])
 
@@ -237,7 +321,7 @@ class SteamWebAPI(utils.Base):
         :param phone_id: Index of phone number
         :return: Updated account login data
         """
-        data = await self._new_mobile_data(steamid)
+        data = self._new_mobile_data(steamid)
         data['device_identifier'] = universe.generate_device_id(access_token)
         data['sms_phone_id'] = phone_id
 
@@ -251,13 +335,11 @@ class SteamWebAPI(utils.Base):
 
         response: Dict[str, Any] = json_data['response']
 
-        if response['status'] == 29:
-            raise AuthenticatorExists('An Authenticator is already active for that account.')
-
-        if response['status'] in [84, 2]:
-            raise PhoneNotRegistered('Phone not registered on Steam Account.')
-
         if response['status'] != 1:
+            if response['status'] in _NEW_AUTHENTICATOR_ERRORS:
+                exception, message = _NEW_AUTHENTICATOR_ERRORS[response['status']]
+                raise exception(message)
+
             raise NotImplementedError(f"add_authenticator is returning status {response['status']}")
 
         return AuthenticatorData(
@@ -289,8 +371,14 @@ class SteamWebAPI(utils.Base):
         :param email_type: Email type
         :return: True if success
         """
-        data = await self._new_mobile_data(steamid)
-        server_time = await self.get_server_time()
+        data = self._new_mobile_data(steamid)
+
+        if self._time_offset is None:
+            server_time = await self.get_server_time()
+        else:
+            # server time is already known, so skip a round trip
+            server_time = int(time.time()) - self._time_offset
+
         data['authenticator_code'] = universe.generate_steam_code(server_time, shared_secret)
         data['activation_code'] = sms_code
         data['validate_sms_code'] = 1
@@ -317,7 +405,7 @@ class SteamWebAPI(utils.Base):
                     data=data,
                     params=params,
                 )
-            except aiohttp.ContentTypeError:
+            except ValueError:  # not json
                 return False
             else:
                 return True
@@ -339,7 +427,7 @@ class SteamWebAPI(utils.Base):
         :param scheme: Steam scheme
         :return: True if success
         """
-        data = await self._new_mobile_data(steamid)
+        data = self._new_mobile_data(steamid)
         data['revocation_code'] = revocation_code
         data['revocation_reason'] = 1
         data['steamguard_scheme'] = scheme
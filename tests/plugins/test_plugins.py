@@ -16,8 +16,11 @@
 # along with this program. If not, see http://www.gnu.org/licenses/.
 #
 
+from pathlib import Path
 from types import ModuleType
 
+import pytest
+
 from stlib import plugins
 
 
@@ -28,3 +31,17 @@ class TestPlugins:
             plugin_module = plugins.get_plugin(plugin)
 
             assert isinstance(plugin_module, ModuleType)
+
+    def test_add_search_paths_strict(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / 'good_plugin.py').write_text('value = 1\n')
+        (tmp_path / 'broken_plugin.py').write_text('raise RuntimeError("broken")\n')
+
+        monkeypatch.setattr(plugins, 'manager', None)
+        plugins.add_search_paths(str(tmp_path))
+        assert isinstance(plugins.manager, plugins._Manager)
+        assert plugins.manager.has_plugin('good_plugin') is True
+        assert plugins.manager.has_plugin('broken_plugin') is False
+
+        monkeypatch.setattr(plugins, 'manager', None)
+        with pytest.raises(plugins.PluginLoaderError):
+            plugins.add_search_paths(str(tmp_path), strict=True)
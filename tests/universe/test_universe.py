@@ -18,11 +18,28 @@
 
 import base64
 
+import pytest
 import rsa
 
 from stlib import universe
 
 
+def _calc_fee(price: int) -> tuple[int, int]:
+    return max(int(price * 0.10), 1), max(int(price * 0.05), 1)
+
+
+def _calc_price_offset(price: int) -> tuple[int, int, int]:
+    # reference implementation: walk down until price + fees fits in price
+    fixed_price = price
+    steam_fee, dev_fee = _calc_fee(fixed_price)
+
+    while fixed_price + steam_fee + dev_fee > price:
+        fixed_price -= 1
+        steam_fee, dev_fee = _calc_fee(fixed_price)
+
+    return fixed_price + steam_fee + dev_fee, steam_fee, dev_fee
+
+
 class TestUniverse:
     def test_generate_otp_code(self) -> None:
         otp_code = universe.generate_otp_code(b'A', b'A')
@@ -62,3 +79,67 @@ class TestUniverse:
 
         password = rsa.decrypt(password_encrypted_raw, private_key)
         assert password.decode() == '0000'
+
+    def test_generate_steamid(self) -> None:
+        expected = universe.SteamId(1, 19867136)
+
+        for steamid in (
+                76561198000000001,
+                '76561198000000001',
+                ' 76561198000000001 ',
+                'STEAM_0:1:19867136',
+                'STEAM_1:1:19867136',
+                'STEAMX:1:19867136',
+                'STEAM_0:1:19867136 ',
+                '[STEAM_0:1:19867136]',
+                '[U:1:39734273]',
+                'U:1:39734273',
+                ' [U:1:39734273] ',
+        ):
+            steamid_ = universe.generate_steamid(steamid)
+            assert steamid_ == expected
+            assert steamid_.id64 == 76561198000000001
+            assert steamid_.id3_string == '[U:1:39734273]'
+            assert steamid_.id_string == 'STEAM_0:1:19867136'
+
+    def test_generate_steamid_invalid(self) -> None:
+        for steamid in ('', 'STEAM_0:1', '[X:1:2]', '7656119800000000', 'U:1:abc'):
+            with pytest.raises(ValueError):
+                universe.generate_steamid(steamid)
+
+    def test_price_offset(self) -> None:
+        for price in range(3, 3000):
+            steam_price = universe.SteamPrice.new_from_integer(price)
+            offset, steam_fee, dev_fee = _calc_price_offset(price)
+
+            assert steam_price.fees(reverse=True, as_integer=True) == (offset, steam_fee, dev_fee)
+            assert steam_price.as_integer(subtract_fees=True) == offset - steam_fee - dev_fee
+
+    def test_bulk_calc_price_offset(self) -> None:
+        numpy = pytest.importorskip('numpy')
+        prices = numpy.arange(3, 3000)
+        offsets, steam_fees, dev_fees = universe.SteamPrice.bulk_calc_price_offset(prices)
+
+        for index, price in enumerate(prices.tolist()):
+            assert (offsets[index], steam_fees[index], dev_fees[index]) == _calc_price_offset(price)
+
+    def test_bulk_fees(self) -> None:
+        numpy = pytest.importorskip('numpy')
+        prices = [round(price / 100, 2) for price in range(3, 3000)]
+
+        for reverse in (False, True):
+            bulk_prices, steam_fees, dev_fees = universe.SteamPrice.bulk_fees(prices, reverse=reverse)
+
+            for index, price in enumerate(prices):
+                fees = universe.SteamPrice(price).fees(reverse=reverse, as_integer=True)
+                assert (bulk_prices[index], steam_fees[index], dev_fees[index]) == fees
+
+        assert isinstance(bulk_prices, numpy.ndarray)
+
+    def test_bulk_generate_steamid(self) -> None:
+        numpy = pytest.importorskip('numpy')
+        steamids = numpy.arange(76561197960265728, 76561197960285728, 7)
+        types, ids = universe.bulk_generate_steamid(steamids)
+
+        for index, steamid in enumerate(steamids.tolist()):
+            assert universe.SteamId(int(types[index]), int(ids[index])) == universe.generate_steamid(steamid)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+#
+# Lara Maia <dev@lara.monster> 2015 ~ 2023
+#
+# The stlib is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# The stlib is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#
+
+import asyncio
+import time
+from typing import AsyncIterator, Dict
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from bs4 import BeautifulSoup
+
+from stlib import utils
+
+BUILD_HOVER_SCRIPT = (
+    '\n\t\tBuildHover( \'confiteminfo\', {"currency":0,"appid":730,"classid":"310776560",'
+    '"type":"Classified Rifle","market_name":"AK-47 | Redline (Field-Tested)",'
+    '"name":"AK-47 | Redline","tradable":1,"descriptions":[{"type":"html","value":"Exterior: Field-Tested"},'
+    '{"type":"html","value":"\\u2605 Rare"}],"tags":[{"category":"Type","name":"Rifle"}]}, UserYou );\n\t'
+)
+
+
+@pytest_asyncio.fixture
+async def json_server() -> AsyncIterator[TestServer]:
+    hits: Dict[str, int] = {}
+
+    async def handler(request: web.Request) -> web.Response:
+        hits[request.path_qs] = hits.get(request.path_qs, 0) + 1
+
+        if request.path == '/limited' and hits[request.path_qs] == 1:
+            return web.json_response({}, status=429, headers={'Retry-After': '86400'})
+
+        return web.json_response({'hits': hits[request.path_qs]})
+
+    app = web.Application()
+    app.router.add_route('*', '/{path:.*}', handler)
+
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[utils.Base]:
+    session_ = await utils.Base.new_session(90)
+    yield session_
+    await utils.Base.destroy_session(90)
+
+
+class TestUtils:
+    def test_get_json_from_js_func(self) -> None:
+        json_data = utils.Base.get_json_from_js_func(BUILD_HOVER_SCRIPT, target="BuildHover")
+
+        assert json_data['type'] == "Classified Rifle"
+        assert json_data['market_name'] == "AK-47 | Redline (Field-Tested)"
+        assert json_data['name'] == "AK-47 | Redline"
+        assert 'value' not in json_data
+        assert 'descriptions' not in json_data
+
+    def test_get_json_from_js_func_without_target(self) -> None:
+        assert utils.Base.get_json_from_js_func(BUILD_HOVER_SCRIPT, target="BuildPopup") == {}
+
+    def test_get_scripts(self) -> None:
+        html = (
+            '<html><head><script type="text/javascript">var first = 1;</script>'
+            '<!-- <script>var commented = 1;</script> --></head>'
+            '<body><SCRIPT>var second = "<!-- not a comment -->";</SCRIPT>'
+            '<script src="empty.js"></script></body></html>'
+        )
+
+        assert utils.Base.get_scripts(html) == ['var first = 1;', 'var second = "<!-- not a comment -->";', '']
+        assert utils.Base.get_scripts(html) == [
+            script.string or '' for script in BeautifulSoup(html, 'html.parser').find_all('script')
+        ]
+
+    async def test_request_json_without_cache(self, json_server: TestServer, session: utils.Base) -> None:
+        url = str(json_server.make_url('/json'))
+
+        assert (await session.request_json(url))['hits'] == 1
+        assert (await session.request_json(url))['hits'] == 2
+
+    async def test_request_json_cache(self, json_server: TestServer, session: utils.Base) -> None:
+        url = str(json_server.make_url('/json'))
+
+        assert (await session.request_json(url, params={'a': '1'}, cache_ttl=0.5))['hits'] == 1
+        assert (await session.request_json(url, params={'a': '1'}, cache_ttl=0.5))['hits'] == 1
+        assert (await session.request_json(url, params={'a': '2'}, cache_ttl=0.5))['hits'] == 1
+
+        await asyncio.sleep(0.6)
+        assert (await session.request_json(url, params={'a': '1'}, cache_ttl=0.5))['hits'] == 2
+
+    async def test_request_json_session_cache_ttl(self, json_server: TestServer) -> None:
+        url = str(json_server.make_url('/json'))
+        session_ = await utils.Base.new_session(91, json_cache_ttl=60)
+
+        try:
+            assert (await session_.request_json(url))['hits'] == 1
+            assert (await session_.request_json(url))['hits'] == 1
+            assert (await session_.request_json(url, cache_ttl=0))['hits'] == 2
+        finally:
+            await utils.Base.destroy_session(91)
+
+    async def test_request_json_cache_only_get(self, json_server: TestServer, session: utils.Base) -> None:
+        url = str(json_server.make_url('/json'))
+
+        assert (await session.request_json(url, data={'a': '1'}, cache_ttl=60))['hits'] == 1
+        assert (await session.request_json(url, data={'a': '1'}, cache_ttl=60))['hits'] == 2
+        assert (await session.request_json(url, http_method='POST', cache_ttl=60))['hits'] == 3
+        assert (await session.request_json(url, http_method='POST', cache_ttl=60))['hits'] == 4
+
+    async def test_request_json_cache_eviction(
+            self,
+            json_server: TestServer,
+            session: utils.Base,
+            monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(utils, '_JSON_CACHE_SIZE', 2)
+        url = str(json_server.make_url('/json'))
+
+        for index in ('1', '2', '1', '3'):
+            await session.request_json(url, params={'a': index}, cache_ttl=60)
+
+        # '2' was the least recently used when '3' was added
+        assert (await session.request_json(url, params={'a': '1'}, cache_ttl=60))['hits'] == 1
+        assert (await session.request_json(url, params={'a': '3'}, cache_ttl=60))['hits'] == 1
+        assert (await session.request_json(url, params={'a': '2'}, cache_ttl=60))['hits'] == 2
+
+    def test_retry_delay(self) -> None:
+        assert 0.25 <= utils._retry_delay(0) <= 0.5
+
+        for attempt in (5, 10, 1000, 10 ** 6):
+            assert 5 <= utils._retry_delay(attempt) <= 5.25
+
+    async def test_retry_after_is_clamped(
+            self,
+            json_server: TestServer,
+            session: utils.Base,
+            monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(utils, '_MAX_RETRY_AFTER', 0.1)
+        url = str(json_server.make_url('/limited'))
+
+        start = time.monotonic()
+        assert (await session.request_json(url))['hits'] == 2
+        assert time.monotonic() - start < 1
+
+    async def test_rate_limit(self, json_server: TestServer) -> None:
+        url = str(json_server.make_url('/json'))
+        session_ = await utils.Base.new_session(92, rate_limit=(2, 0.4))
+
+        try:
+            start = time.monotonic()
+
+            for _ in range(4):
+                await session_.request_json(url)
+
+            # two requests fit in the bucket, the others wait 0.2 seconds each
+            assert time.monotonic() - start >= 0.35
+        finally:
+            await utils.Base.destroy_session(92)
+
+    async def test_invalid_rate_limit(self) -> None:
+        for rate_limit in ((0, 1), (1, 0), (-1, 1)):
+            with pytest.raises(ValueError):
+                await utils.Base.new_session(93, rate_limit=rate_limit)
+
+        # a failed session isn't kept, so the index can be used again
+        await utils.Base.new_session(93, rate_limit=(1, 1))
+        await utils.Base.destroy_session(93)
@@ -30,6 +30,21 @@ async def test_server_time(webapi_session) -> None:
     assert len(str(server_time)) == 10
 
 
+async def test_get_player_summary(webapi_session, steamid) -> None:
+    player_summary = await webapi_session.get_player_summary(steamid)
+    assert isinstance(player_summary, webapi.PlayerSummary)
+    assert player_summary.steamid == steamid
+    debug(str(player_summary), wait_for=0)
+
+
+async def test_get_player_summaries(webapi_session, steamid) -> None:
+    player_summaries = await webapi_session.get_player_summaries([steamid])
+    assert isinstance(player_summaries, list)
+    assert all(isinstance(player_summary, webapi.PlayerSummary) for player_summary in player_summaries)
+    assert player_summaries[0].steamid == steamid
+    debug(str(player_summaries), wait_for=0)
+
+
 async def test_get_custom_profile_url(webapi_session, steamid) -> None:
     profile_url = await webapi_session.get_custom_profile_url(steamid)
     assert isinstance(profile_url, str)